@@ -76,7 +76,7 @@ class Usuario(db.Model):
 class Restaurantes(db.Model):
     __tablename__ = 'restaurantes' 
     id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(30), unique=False, nullable=False)
+    email = db.Column(db.String(30), unique=False, nullable=False, index=True)
     nombre = db.Column(db.String(30), unique=True, nullable=False)
     direccion = db.Column(db.String(150), nullable=True)
     telefono = db.Column(db.String(20), nullable=False)
@@ -122,7 +122,7 @@ class Restaurantes(db.Model):
             "horario_tarde_fin": self.horario_tarde_fin.isoformat() if self.horario_tarde_fin else None,
             "reservas_por_dia": self.reservas_por_dia,
             "categorias_id": self.categorias_id,
-            "restaurantes_mesa": list(map(lambda x: x.serialize(), self.restaurantes_mesa)),
+            "restaurantes_mesa": [mesa.serialize() for mesa in self.restaurantes_mesa],
             "image": self.image
         }
 
@@ -164,6 +164,10 @@ class Categorias(db.Model):
 
 class Restaurantes_Favoritos(db.Model):
         __tablename__ = 'restaurantes_favoritos'
+        __table_args__ = (
+            # Índice único para que la comprobación de duplicados sea un lookup y no un scan
+            db.UniqueConstraint('usuario_id', 'restaurantes_id', name='uq_fav'),
+        )
         id = db.Column(db.Integer, primary_key=True)
         usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'))
         restaurantes_id = db.Column(db.Integer, db.ForeignKey('restaurantes.id'))
@@ -180,9 +184,13 @@ class Restaurantes_Favoritos(db.Model):
 
 class Valoracion(db.Model):
     __tablename__ = 'valoracion'
+    __table_args__ = (
+        # Un usuario solo valora una vez cada restaurante; indexa además el filtro por restaurante
+        db.UniqueConstraint('usuario_id', 'restaurante_id', name='uq_valoracion'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id'))
-    restaurante_id = db.Column(db.Integer, db.ForeignKey('restaurantes.id'))
+    restaurante_id = db.Column(db.Integer, db.ForeignKey('restaurantes.id'), index=True)
     puntuacion = db.Column(db.Integer, nullable=False)
     comentario = db.Column(db.Text, nullable=True)
     fecha = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
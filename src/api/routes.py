@@ -1,80 +1,122 @@
 """
 This module takes care of starting the API Server, Loading the DB and Adding the endpoints
 """
-from flask import request, jsonify, Blueprint
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask import request, jsonify, Blueprint, Response
+import orjson
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
 from api.models import db, Usuario, Reserva, Restaurantes_Favoritos, Valoracion, Restaurantes, Categorias
-from api.utils import validar_horario_reserva, generate_sitemap, APIException
+from api.utils import validar_horario_reserva, generate_sitemap, APIException, cache
 from flask_cors import CORS
 from datetime import datetime, timezone
 from werkzeug.security import check_password_hash, generate_password_hash
-import re 
+import re
 import cloudinary.uploader
+import cloudinary.utils
+from concurrent.futures import ThreadPoolExecutor
+from threading import Timer
+from uuid import uuid4
 
 api = Blueprint('api', __name__)
 
 # Allow CORS requests to this API
 CORS(api)
 
+# Respuestas de error repetidas: el cuerpo se serializa una única vez al cargar
+# el módulo y cada request solo construye el objeto Response sobre esos bytes
+def _respuesta_precompilada(body, status):
+    data = orjson.dumps(body)
+    return lambda: Response(data, status=status, mimetype='application/json')
+
+_ERR_USUARIO_NO_ENCONTRADO = _respuesta_precompilada({'msg': 'Usuario no encontrado'}, 404)
+_ERR_RESTAURANTE_NO_ENCONTRADO = _respuesta_precompilada({'msg': 'Restaurante no encontrado'}, 404)
+_ERR_CREDENCIALES_INVALIDAS = _respuesta_precompilada({'msg': 'Credenciales inválidas'}, 401)
+_ERR_CONTRASENA_INCORRECTA = _respuesta_precompilada({'msg': 'Contraseña incorrecta'}, 401)
+_ERR_USUARIO_EXISTE = _respuesta_precompilada({'msg': 'El usuario ya existe'}, 409)
+_ERR_RESERVA_NO_ENCONTRADA = _respuesta_precompilada({"error": "Reserva no encontrada"}, 404)
+
+# Respuestas de éxito constantes: mismo truco, el cuerpo ya viene serializado
+_OK_CATEGORIAS_CREADAS = _respuesta_precompilada({"message": "Categorías creadas correctamente"}, 201)
+_OK_RESERVA_ELIMINADA = _respuesta_precompilada({"message": "Reserva eliminada con éxito"}, 200)
+_OK_FAVORITO_ELIMINADO = _respuesta_precompilada({"message": "Restaurante eliminado de favoritos"}, 200)
+_OK_VALORACION_ELIMINADA = _respuesta_precompilada({"message": "Valoración eliminada con éxito"}, 200)
+_OK_SIN_VALORACIONES = _respuesta_precompilada({"message": "Este restaurante no tiene valoraciones"}, 200)
+
+
+# Regexes precompiladas una sola vez al cargar el módulo (evita recompilarlas en cada request)
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+_PHONE_RE = re.compile(r'^[\d\+\-\s]+$')  # Permitir solo números, +, -, y espacios
+
 def is_valid_email(email):
-    email_regex = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-    return re.match(email_regex, email)
+    return _EMAIL_RE.match(email) is not None
 
 def is_valid_password(password):
     if len(password) < 8 or len(password) > 16:
         return False
-    if not re.search(r'[A-Z]', password):  # Al menos una mayúscula
-        return False
-    if not re.search(r'[0-9]', password):  # Al menos un número
-        return False
-    return True
+    # Un solo recorrido buscando al menos una mayúscula y un número,
+    # sin pasar por el motor de regex
+    has_upper = has_digit = False
+    for c in password:
+        if 'A' <= c <= 'Z':
+            has_upper = True
+        elif '0' <= c <= '9':
+            has_digit = True
+        if has_upper and has_digit:
+            return True
+    return False
 
 
 def is_valid_phone(phone):
-    # Permitir solo números, +, -, y espacios
-    phone_regex = r'^[\d\+\-\s]+$'
-    if len(phone) < 9:  
+    if len(phone) < 9:
         return False
-    if not re.match(phone_regex, phone):
+    if not _PHONE_RE.match(phone):
         return False
     return True
 
 
 # REGISTRO USUARIO
 
-@api.route('/signup', methods=['POST'])
-def signup():
-    body = request.get_json()
-    
-    email = body.get('email')
-    password = body.get('password')
-    nombres = body.get('nombres')
-    apellidos = body.get('apellidos')
-    telefono = body.get('telefono')
+# Esquema del signup: campos obligatorios y validadores de formato, recorridos
+# en un único bucle con una sola construcción de respuesta en caso de fallo
+_SIGNUP_CAMPOS = ('email', 'password', 'nombres', 'apellidos', 'telefono')
+_SIGNUP_VALIDADORES = (
+    ('email', is_valid_email, 'Formato de email no válido'),
+    ('password', is_valid_password, 'La contraseña debe tener entre 8 y 16 caracteres, al menos una mayúscula y un número'),
+    ('telefono', is_valid_phone, 'Formato de teléfono no válido. Debe contener al menos 9 caracteres y solo números, +, y -'),
+)
+
+def _validar_signup(body):
+    # Devuelve el mensaje de error, o None si el body es válido
+    for campo in _SIGNUP_CAMPOS:
+        if not body.get(campo):
+            return 'Faltan datos'
+    for campo, valido, mensaje in _SIGNUP_VALIDADORES:
+        if not valido(body[campo]):
+            return mensaje
+    return None
 
-    if not email or not password or not nombres or not apellidos or not telefono:
-        return jsonify({'msg': 'Faltan datos'}), 400
 
-    if not is_valid_email(email):
-        return jsonify({'msg': 'Formato de email no válido'}), 400
+@api.route('/signup', methods=['POST'])
+def signup():
+    body = request.get_json(silent=True) or {}
 
-    if not is_valid_password(password):
-        return jsonify({'msg': 'La contraseña debe tener entre 8 y 16 caracteres, al menos una mayúscula y un número'}), 400
+    error = _validar_signup(body)
+    if error is not None:
+        return jsonify({'msg': error}), 400
 
-    if not is_valid_phone(telefono):
-        return jsonify({'msg': 'Formato de teléfono no válido. Debe contener al menos 9 caracteres y solo números, +, y -'}), 400
+    email = body['email']
 
-    if Usuario.query.filter_by(email=email).first():
-        return jsonify({'msg': 'El usuario ya existe'}), 409  
+    # EXISTS devuelve un booleano sin transferir ni hidratar la fila
+    if db.session.query(Usuario.query.filter_by(email=email).exists()).scalar():
+        return _ERR_USUARIO_EXISTE()
 
     new_user = Usuario(
         email=email,
-        nombres=nombres,
-        apellidos=apellidos,
-        telefono=telefono,
+        nombres=body['nombres'],
+        apellidos=body['apellidos'],
+        telefono=body['telefono'],
         creado=datetime.now(timezone.utc)
     )
-    new_user.set_password(password)  
+    new_user.set_password(body['password'])
     db.session.add(new_user)
     db.session.commit()
 
@@ -87,27 +129,33 @@ def signup():
 
 @api.route('/login', methods=['POST'])
 def login():
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
     email = body.get('email')
     password = body.get('password')
 
     if not email or not password:
-        return jsonify({'msg': 'Credenciales inválidas'}), 401
+        return _ERR_CREDENCIALES_INVALIDAS()
 
-    user = Usuario.query.filter_by(email=email).first()
+    # Solo las columnas necesarias: nada de materializar el objeto Usuario completo
+    user = db.session.execute(
+        db.select(Usuario.id, Usuario.password_hash, Usuario.nombres)
+        .filter_by(email=email)
+    ).first()
     if user is None:
         return jsonify({'msg': 'El usuario no está registrado'}), 404
 
-    if not user.check_password(password):
-        return jsonify({'msg': 'Contraseña incorrecta'}), 401
+    if not check_password_hash(user.password_hash, password):
+        return _ERR_CONTRASENA_INCORRECTA()
 
-    access_token = create_access_token(identity=user.id)
-    refresh_token = create_refresh_token(identity=user.id)
+    # Los datos básicos viajan como claims firmados: validar el token no necesita BD
+    claims = {'email': email, 'nombres': user.nombres}
+    access_token = create_access_token(identity=user.id, additional_claims=claims)
+    refresh_token = create_refresh_token(identity=user.id, additional_claims=claims)
 
     return jsonify({
         'access_token': access_token,
         'refresh_token': refresh_token,
-        'user_name': user.nombres, 
+        'user_name': user.nombres,
         'user_id': user.id
     }), 200
 
@@ -119,7 +167,10 @@ def login():
 @jwt_required(refresh=True)
 def refresh():
     current_user_id = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user_id)
+    # Propaga los claims del refresh token al nuevo access token
+    claims = get_jwt()
+    extra = {k: claims[k] for k in ('email', 'nombres') if k in claims}
+    new_access_token = create_access_token(identity=current_user_id, additional_claims=extra)
     return jsonify({
         'access_token': new_access_token
     }), 200
@@ -132,10 +183,10 @@ def refresh():
 @jwt_required()
 def protected():
     current_user_id = get_jwt_identity()  
-    user = Usuario.query.get(current_user_id)
+    user = db.session.get(Usuario, current_user_id)
 
     if user is None:
-        return jsonify({'msg': 'Usuario no encontrado'}), 404
+        return _ERR_USUARIO_NO_ENCONTRADO()
 
     return jsonify({
         'id': user.id,
@@ -152,29 +203,45 @@ def protected():
 @api.route('/validate-token', methods=['GET'])
 @jwt_required()
 def validate_token():
-    current_user_id = get_jwt_identity()  
-    user = Usuario.query.get(current_user_id)
+    current_user_id = get_jwt_identity()
+    email = get_jwt().get('email')
 
-    if user is None:
-        return jsonify({'msg': 'Usuario no encontrado'}), 404
+    if email is None:
+        # Token sin claims (p. ej. de restaurante o emitido antes del cambio)
+        user = db.session.get(Usuario, current_user_id)
 
-    return jsonify({'msg': 'Token válido', 'user_id': user.id, 'email': user.email}), 200
+        if user is None:
+            return _ERR_USUARIO_NO_ENCONTRADO()
+        email = user.email
+
+    return jsonify({'msg': 'Token válido', 'user_id': current_user_id, 'email': email}), 200
 
 # OBTENER TODOS LOS USUARIOS
 
 @api.route('/usuarios', methods=['GET'])
 def get_all_users():
-    usuarios = Usuario.query.all()
-    return jsonify([usuario.serialize() for usuario in usuarios]), 200
+    # Seleccionamos solo las columnas que se devuelven, sin hidratar objetos ORM
+    rows = db.session.execute(
+        db.select(Usuario.id, Usuario.email, Usuario.nombres,
+                  Usuario.apellidos, Usuario.telefono, Usuario.creado)
+    ).all()
+    return jsonify([{
+        'id': r.id,
+        'email': r.email,
+        'nombres': r.nombres,
+        'apellidos': r.apellidos,
+        'telefono': r.telefono,
+        'creado': r.creado.isoformat()
+    } for r in rows]), 200
 
 # OBTENER UN USUARIO
 
 @api.route('/usuario/<int:usuario_id>', methods=['GET'])
 @jwt_required()
 def get_user(usuario_id):
-    usuario = Usuario.query.get(usuario_id)
+    usuario = db.session.get(Usuario, usuario_id)
     if not usuario:
-        return jsonify({'msg': 'Usuario no encontrado'}), 404
+        return _ERR_USUARIO_NO_ENCONTRADO()
     
     return jsonify(usuario.serialize()), 200
 
@@ -183,11 +250,11 @@ def get_user(usuario_id):
 @api.route('/usuario/<int:usuario_id>', methods=['PUT'])
 @jwt_required()
 def update_user(usuario_id):
-    body = request.get_json()
-    usuario = Usuario.query.get(usuario_id)
+    body = request.get_json(silent=True) or {}
+    usuario = db.session.get(Usuario, usuario_id)
 
     if not usuario:
-        return jsonify({'msg': 'Usuario no encontrado'}), 404
+        return _ERR_USUARIO_NO_ENCONTRADO()
     
     # Actualiza datos del usuario
     usuario.nombres = body.get('nombres', usuario.nombres)
@@ -206,10 +273,10 @@ def update_user(usuario_id):
 @api.route('/usuario/<int:usuario_id>', methods=['DELETE'])
 @jwt_required()
 def delete_user(usuario_id):
-    usuario = Usuario.query.get(usuario_id)
+    usuario = db.session.get(Usuario, usuario_id)
 
     if not usuario:
-        return jsonify({'msg': 'Usuario no encontrado'}), 404
+        return _ERR_USUARIO_NO_ENCONTRADO()
 
     db.session.delete(usuario)
     db.session.commit()
@@ -222,7 +289,7 @@ def delete_user(usuario_id):
 
 @api.route('/signup/restaurante', methods=['POST'])
 def signup_restaurante():
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
 
     nombre = body.get('nombre')
     email = body.get('email')
@@ -232,7 +299,7 @@ def signup_restaurante():
     if not (nombre and email and password and telefono):
         return jsonify({'msg': 'Faltan datos obligatorios'}), 400
 
-    if Restaurantes.query.filter_by(email=email).first():
+    if db.session.query(Restaurantes.query.filter_by(email=email).exists()).scalar():
         return jsonify({'msg': 'El restaurante ya existe'}), 409
 
     hashed_password = generate_password_hash(password)
@@ -246,6 +313,7 @@ def signup_restaurante():
 
     db.session.add(nuevo_restaurante)
     db.session.commit()
+    _invalidar_cache_restaurantes()
 
     return jsonify({'msg': 'Restaurante registrado con éxito', 'restaurante_id': nuevo_restaurante.id}), 201
 
@@ -254,9 +322,9 @@ def signup_restaurante():
 @api.route('/restaurante/<int:restaurante_id>/completar', methods=['PUT'])
 @jwt_required()
 def completar_registro_restaurante(restaurante_id):
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
 
-    restaurante = Restaurantes.query.get_or_404(restaurante_id)
+    restaurante = db.get_or_404(Restaurantes, restaurante_id)
 
     if restaurante.registro_completo:
         return jsonify({'msg': 'El restaurante ya ha completado su registro'}), 400
@@ -279,6 +347,7 @@ def completar_registro_restaurante(restaurante_id):
         return jsonify({'msg': 'Faltan datos para completar el registro'}), 400
 
     db.session.commit()
+    _invalidar_cache_restaurantes()
 
     return jsonify({'msg': 'Registro completado con éxito', 'registro_completo': restaurante.registro_completo}), 200
 
@@ -288,19 +357,19 @@ def completar_registro_restaurante(restaurante_id):
 
 @api.route('/login/restaurante', methods=['POST'])
 def login_restaurante():
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
     email = body.get('email')
     password = body.get('password')
 
     if not email or not password:
-        return jsonify({'msg': 'Credenciales inválidas'}), 401
+        return _ERR_CREDENCIALES_INVALIDAS()
 
     restaurante = Restaurantes.query.filter_by(email=email).first()
     if restaurante is None:
         return jsonify({'msg': 'El restaurante no está registrado'}), 404
 
     if not restaurante.check_password(password):
-        return jsonify({'msg': 'Contraseña incorrecta'}), 401
+        return _ERR_CONTRASENA_INCORRECTA()
 
     access_token = create_access_token(identity=restaurante.id)
     refresh_token = create_refresh_token(identity=restaurante.id)
@@ -324,19 +393,40 @@ def login_restaurante():
 
 # OBTENER TODOS LOS RESTAURANTES
 
+# El listado cambia poco: se memoiza 60s y cualquier endpoint que modifique
+# restaurantes lo invalida con _invalidar_cache_restaurantes()
+_RESTAURANTES_CACHE_KEY = 'restaurantes_list'
+
+def _invalidar_cache_restaurantes():
+    cache.delete(_RESTAURANTES_CACHE_KEY)
+
+
 @api.route('/restaurantes', methods=['GET'])
 def get_all_restaurantes():
-    restaurantes = Restaurantes.query.all()
-    return jsonify([restaurante.serialize() for restaurante in restaurantes]), 200
+    payload = cache.get(_RESTAURANTES_CACHE_KEY)
+    if payload is None:
+        # selectinload trae todas las mesas en una segunda consulta en vez de
+        # un SELECT por restaurante al serializar restaurantes_mesa
+        restaurantes = Restaurantes.query.options(
+            db.selectinload(Restaurantes.restaurantes_mesa)).all()
+        payload = [restaurante.serialize() for restaurante in restaurantes]
+        cache.set(_RESTAURANTES_CACHE_KEY, payload, timeout=60)
+
+    response = jsonify(payload)
+    # ETag para que los clientes repetidos reciban 304 Not Modified sin cuerpo
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 # OBTENER UN RESTAURANTE
 
 @api.route('/restaurantes/<int:restaurante_id>', methods=['GET'])
 def get_restaurante(restaurante_id):
-    restaurante = Restaurantes.query.get(restaurante_id)
+    restaurante = db.session.get(
+        Restaurantes, restaurante_id,
+        options=[db.selectinload(Restaurantes.restaurantes_mesa)])
     if not restaurante:
-        return jsonify({'msg': 'Restaurante no encontrado'}), 404
+        return _ERR_RESTAURANTE_NO_ENCONTRADO()
 
     return jsonify(restaurante.serialize()), 200
 
@@ -347,14 +437,15 @@ def get_restaurante(restaurante_id):
 @api.route('/restaurantes/<int:restaurante_id>', methods=['PUT'])
 @jwt_required()
 def update_restaurante(restaurante_id):
-    body = request.get_json()
-    restaurante = Restaurantes.query.get(restaurante_id)
+    body = request.get_json(silent=True) or {}
+    restaurante = db.session.get(Restaurantes, restaurante_id)
 
     if not restaurante:
-        return jsonify({'msg': 'Restaurante no encontrado'}), 404
+        return _ERR_RESTAURANTE_NO_ENCONTRADO()
 
     nuevo_email = body.get('email', restaurante.email)
-    if nuevo_email != restaurante.email and Restaurantes.query.filter_by(email=nuevo_email).first():
+    if nuevo_email != restaurante.email and db.session.query(
+            Restaurantes.query.filter_by(email=nuevo_email).exists()).scalar():
         return jsonify({'msg': 'El email ya está en uso'}), 409
 
     restaurante.nombre = body.get('nombre', restaurante.nombre)
@@ -380,6 +471,7 @@ def update_restaurante(restaurante_id):
     restaurante.categorias_id = body.get('categorias_id', restaurante.categorias_id)
 
     db.session.commit()
+    _invalidar_cache_restaurantes()
 
     return jsonify({'msg': 'Restaurante actualizado con éxito'}), 200
 
@@ -391,13 +483,14 @@ def update_restaurante(restaurante_id):
 @api.route('/restaurantes/<int:restaurante_id>', methods=['DELETE'])
 @jwt_required()  
 def delete_restaurante(restaurante_id):
-    restaurante = Restaurantes.query.get(restaurante_id)
+    restaurante = db.session.get(Restaurantes, restaurante_id)
 
     if not restaurante:
-        return jsonify({'msg': 'Restaurante no encontrado'}), 404
+        return _ERR_RESTAURANTE_NO_ENCONTRADO()
 
     db.session.delete(restaurante)
     db.session.commit()
+    _invalidar_cache_restaurantes()
 
     return jsonify({'msg': 'Restaurante eliminado con éxito'}), 200
 
@@ -407,7 +500,9 @@ def delete_restaurante(restaurante_id):
 
 @api.route('/categorias', methods=['POST'])
 def create_categoria():
-    data = request.json
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"message": "Petición sin JSON válido"}), 400
     if isinstance(data, list):
         for categoria_data in data:
             nueva_categoria = Categorias(nombre_de_categoria=categoria_data['nombre_de_categoria'])
@@ -418,7 +513,7 @@ def create_categoria():
     
     db.session.commit()
     
-    return jsonify({"message": "Categorías creadas correctamente"}), 201
+    return _OK_CATEGORIAS_CREADAS()
 
 
 
@@ -434,7 +529,7 @@ def get_categorias():
 
 @api.route('/categorias/<int:categoria_id>', methods=['GET'])
 def get_categoria(categoria_id):
-    categoria = Categorias.query.get_or_404(categoria_id)  
+    categoria = db.get_or_404(Categorias, categoria_id)  
     return jsonify(categoria.serialize()), 200  
 
 
@@ -442,7 +537,9 @@ def get_categoria(categoria_id):
 
 @api.route('/categorias/<int:categoria_id>/restaurantes', methods=['GET'])
 def get_restaurantes_por_categoria(categoria_id):
-    restaurantes = Restaurantes.query.filter_by(categorias_id=categoria_id).all()
+    restaurantes = Restaurantes.query.options(
+        db.selectinload(Restaurantes.restaurantes_mesa)
+    ).filter_by(categorias_id=categoria_id).all()
 
     if not restaurantes:
         return jsonify({"message": "No se encontraron restaurantes para esta categoría"}), 404
@@ -458,7 +555,7 @@ from api.utils import validar_horario_reserva
 @api.route('/usuario/reservas', methods=['POST'])
 @jwt_required()
 def crear_reserva():
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
     print(body)
     usuario_id = get_jwt_identity()
     restaurante_id = body.get('restaurante_id')
@@ -477,7 +574,7 @@ def crear_reserva():
     except ValueError:
         return jsonify({"error": "Formato de fecha no válido. Usa el formato YYYY-MM-DD HH:MM:SS"}), 400
 
-    restaurante = Restaurantes.query.get(restaurante_id)
+    restaurante = db.session.get(Restaurantes, restaurante_id)
     if not restaurante:
         return jsonify({"error": "Restaurante no encontrado"}), 404
 
@@ -509,20 +606,40 @@ def crear_reserva():
 
 @api.route('/usuario/<int:user_id>/reservas', methods=['GET'])
 def obtener_reservas_usuario(user_id):
-    reservas = Reserva.query.filter_by(user_id=user_id).all()
-    reservas_serializadas = list(map(lambda r: r.serialize(), reservas))
-    
+    # Una sola consulta con join al restaurante, sin hidratar objetos ORM
+    rows = db.session.execute(
+        db.select(Reserva.id, Reserva.user_id, Reserva.fecha_reserva,
+                  Reserva.trona, Reserva.adultos, Reserva.niños,
+                  Reserva.restaurante_id, Restaurantes.nombre,
+                  Reserva.creada, Reserva.modificada)
+        .join(Restaurantes, Reserva.restaurante_id == Restaurantes.id)
+        .filter(Reserva.user_id == user_id)
+    ).all()
+
+    reservas_serializadas = [{
+        "id": r.id,
+        "user_id": r.user_id,
+        "fecha_reserva": r.fecha_reserva.isoformat(),
+        "trona": r.trona,
+        "adultos": r.adultos,
+        "niños": r.niños,
+        "restaurante_id": r.restaurante_id,
+        "restaurant_name": r.nombre,
+        "creada": r.creada.isoformat(),
+        "modificada": r.modificada.isoformat()
+    } for r in rows]
+
     return jsonify(reservas_serializadas), 200
 
 #ACTUALIZAR RESERVA
 
 @api.route('/reservas/<int:reserva_id>', methods=['PUT'])
 def actualizar_reserva(reserva_id):
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
     
-    reserva = Reserva.query.get(reserva_id)
+    reserva = db.session.get(Reserva, reserva_id)
     if not reserva:
-        return jsonify({"error": "Reserva no encontrada"}), 404
+        return _ERR_RESERVA_NO_ENCONTRADA()
 
     if 'adultos' in body:
         reserva.adultos = body['adultos']
@@ -542,14 +659,14 @@ def actualizar_reserva(reserva_id):
 
 @api.route('/reservas/<int:reserva_id>', methods=['DELETE'])
 def cancelar_reserva(reserva_id):
-    reserva = Reserva.query.get(reserva_id)
-    if not reserva:
-        return jsonify({"error": "Reserva no encontrada"}), 404
-
-    db.session.delete(reserva)
+    # DELETE directo con comprobación del rowcount, sin cargar la reserva antes
+    eliminadas = Reserva.query.filter_by(id=reserva_id).delete(synchronize_session=False)
     db.session.commit()
 
-    return jsonify({"message": "Reserva eliminada con éxito"}), 200
+    if not eliminadas:
+        return _ERR_RESERVA_NO_ENCONTRADA()
+
+    return _OK_RESERVA_ELIMINADA()
 
 
 #CREAR FAVORITOS
@@ -558,14 +675,15 @@ def cancelar_reserva(reserva_id):
 @jwt_required()
 def agregar_favorito(usuario_id):
 
-    body = request.json
+    body = request.get_json(silent=True) or {}
 
     restaurante_id = body.get('restaurante_id')
 
     if not usuario_id or not restaurante_id :
         return jsonify({"error": "Faltan datos para agregar a favoritos"}), 400
 
-    favorito_existente = Restaurantes_Favoritos.query.filter_by(usuario_id=usuario_id, restaurantes_id=restaurante_id).first()
+    favorito_existente = db.session.query(Restaurantes_Favoritos.query.filter_by(
+        usuario_id=usuario_id, restaurantes_id=restaurante_id).exists()).scalar()
     if favorito_existente:
         return jsonify({"error": "El restaurante ya está en favoritos"}), 400
 
@@ -592,7 +710,7 @@ def eliminar_favorito(usuario_id, restaurante_id):
     db.session.delete(favorito)
     db.session.commit()
 
-    return jsonify({"message": "Restaurante eliminado de favoritos"}), 200
+    return _OK_FAVORITO_ELIMINADO()
 
 # ELIMINAR 1 FAVORITO DEL USUARIO
 
@@ -614,26 +732,27 @@ def eliminar_un_favorito(usuario_id, favorito_id):
 def obtener_favoritos(usuario_id):                     
 
           
-    usuario = Usuario.query.get(usuario_id)
+    usuario = db.session.get(Usuario, usuario_id)
     
     if not usuario:
         return jsonify({"error": "Usuario no encontrado"}), 404
 
     
-    favoritos = Restaurantes_Favoritos.query.filter_by(usuario_id=usuario_id).all()
-
-    
-    resultado = []
-    for favorito in favoritos:
-        restaurante = Restaurantes.query.get(favorito.restaurantes_id)
-        if restaurante:
-            resultado.append({
-                "restaurante_id": restaurante.id,
-                "nombre": restaurante.nombre,
-                "direccion": restaurante.direccion,
-                "telefono": restaurante.telefono,
-                "image": restaurante.image
-            })
+    # Join en una sola consulta en lugar de un SELECT por favorito
+    rows = db.session.execute(
+        db.select(Restaurantes.id, Restaurantes.nombre, Restaurantes.direccion,
+                  Restaurantes.telefono, Restaurantes.image)
+        .join(Restaurantes_Favoritos, Restaurantes_Favoritos.restaurantes_id == Restaurantes.id)
+        .filter(Restaurantes_Favoritos.usuario_id == usuario_id)
+    ).all()
+
+    resultado = [{
+        "restaurante_id": r.id,
+        "nombre": r.nombre,
+        "direccion": r.direccion,
+        "telefono": r.telefono,
+        "image": r.image
+    } for r in rows]
 
     return jsonify({"restaurantes_favoritos": resultado}), 200
 
@@ -641,7 +760,7 @@ def obtener_favoritos(usuario_id):
 
 @api.route('/usuario/<int:user_id>/valoraciones', methods=['POST'])
 def agregar_valoracion(user_id):
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
 
     restaurante_id = body.get('restaurante_id')
     puntuacion = body.get('puntuacion')
@@ -650,7 +769,8 @@ def agregar_valoracion(user_id):
     if not all([user_id, restaurante_id, puntuacion]):
         return jsonify({"error": "Faltan datos para la valoración"}), 400
 
-    valoracion_existente = Valoracion.query.filter_by(usuario_id=user_id, restaurante_id=restaurante_id).first()
+    valoracion_existente = db.session.query(Valoracion.query.filter_by(
+        usuario_id=user_id, restaurante_id=restaurante_id).exists()).scalar()
     if valoracion_existente:
         return jsonify({"error": "Ya has valorado este restaurante"}), 400
 
@@ -670,7 +790,7 @@ def agregar_valoracion(user_id):
 
 @api.route('/usuario/<int:user_id>/valoraciones', methods=['PUT'])
 def actualizar_valoracion(user_id):
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
 
     restaurante_id = body.get('restaurante_id')
     puntuacion = body.get('puntuacion')
@@ -693,7 +813,7 @@ def actualizar_valoracion(user_id):
 
 @api.route('/usuario/<int:user_id>/valoraciones', methods=['DELETE'])
 def eliminar_valoracion(user_id):
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
 
     restaurante_id = body.get('restaurante_id')
 
@@ -708,34 +828,74 @@ def eliminar_valoracion(user_id):
     db.session.delete(valoracion)
     db.session.commit()
 
-    return jsonify({"message": "Valoración eliminada con éxito"}), 200
+    return _OK_VALORACION_ELIMINADA()
 
 #OBTENER VALORACION
 
 @api.route('/restaurante/<int:restaurante_id>/valoracion', methods=['GET'])
 def obtener_valoracion_restaurante(restaurante_id):
-    valoraciones = Valoracion.query.filter_by(restaurante_id=restaurante_id).all()
-    
-    if not valoraciones:
-        return jsonify({"message": "Este restaurante no tiene valoraciones"}), 200
-    
-    all_valoraciones = list(map(lambda x: x.serialize(), valoraciones))
-    
+    rows = db.session.execute(
+        db.select(Valoracion.id, Valoracion.usuario_id, Valoracion.restaurante_id,
+                  Valoracion.puntuacion, Valoracion.comentario, Valoracion.fecha)
+        .filter(Valoracion.restaurante_id == restaurante_id)
+    ).all()
+
+    if not rows:
+        return _OK_SIN_VALORACIONES()
+
+    all_valoraciones = [{
+        "id": r.id,
+        "usuario_id": r.usuario_id,
+        "restaurante_id": r.restaurante_id,
+        "puntuacion": r.puntuacion,
+        "comentario": r.comentario,
+        "fecha": r.fecha,
+    } for r in rows]
+
     return jsonify(all_valoraciones), 200
 
+#OBTENER VALORACIONES Y PROMEDIO EN UNA SOLA CONSULTA
+
+@api.route('/restaurante/<int:restaurante_id>/valoraciones', methods=['GET'])
+def obtener_valoraciones_con_promedio(restaurante_id):
+    # Función de ventana: las filas y el promedio llegan en un único round-trip
+    rows = db.session.execute(
+        db.select(Valoracion.id, Valoracion.usuario_id, Valoracion.restaurante_id,
+                  Valoracion.puntuacion, Valoracion.comentario, Valoracion.fecha,
+                  db.func.avg(Valoracion.puntuacion).over().label('promedio'))
+        .filter(Valoracion.restaurante_id == restaurante_id)
+    ).all()
+
+    valoraciones = [{
+        "id": r.id,
+        "usuario_id": r.usuario_id,
+        "restaurante_id": r.restaurante_id,
+        "puntuacion": r.puntuacion,
+        "comentario": r.comentario,
+        "fecha": r.fecha,
+    } for r in rows]
+
+    return jsonify({
+        "restaurante_id": restaurante_id,
+        # float(): en Postgres la ventana avg() devuelve Decimal
+        "promedio_valoracion": float(rows[0].promedio) if rows else None,
+        "valoraciones": valoraciones
+    }), 200
+
 #PROMEDIAR VALORACIONES
 
 @api.route('/restaurante/<int:restaurante_id>/valoracion_promedio', methods=['GET'])
 def obtener_valoracion_promedio(restaurante_id):
-    valoraciones = Valoracion.query.filter_by(restaurante_id=restaurante_id).all()
-
-    if not valoraciones:
-        return jsonify({"message": "Este restaurante no tiene valoraciones"}), 200
+    # La base de datos calcula el promedio: una sola fila de vuelta
+    promedio, total = db.session.query(
+        db.func.avg(Valoracion.puntuacion), db.func.count(Valoracion.id)
+    ).filter_by(restaurante_id=restaurante_id).one()
 
-    total_valoraciones = sum([valoracion.puntuacion for valoracion in valoraciones])
-    promedio = total_valoraciones / len(valoraciones)
+    if not total:
+        return _OK_SIN_VALORACIONES()
 
-    return jsonify({"restaurante_id": restaurante_id, "promedio_valoracion": promedio}), 200
+    # En Postgres avg() devuelve Decimal; float() mantiene el número en el JSON
+    return jsonify({"restaurante_id": restaurante_id, "promedio_valoracion": float(promedio)}), 200
 
 
 
@@ -758,24 +918,97 @@ def upload_image():
 
     except Exception as e:
         return jsonify({"msg": "Error subiendo la imagen", "error": str(e)}), 400
-    
+
+
+# FIRMA PARA SUBIDA DIRECTA A CLOUDINARY
+# El navegador sube la imagen directamente a api.cloudinary.com con esta firma,
+# así el worker de Flask no se queda bloqueado durante la subida
+
+@api.route('/upload_image/firma', methods=['GET'])
+def firmar_subida_imagen():
+    timestamp = int(datetime.now(timezone.utc).timestamp())
+    signature = cloudinary.utils.api_sign_request(
+        {'timestamp': timestamp}, cloudinary.config().api_secret)
+
+    return jsonify({
+        'signature': signature,
+        'timestamp': timestamp,
+        'api_key': cloudinary.config().api_key,
+        'cloud_name': cloudinary.config().cloud_name
+    }), 200
+
+
+# SUBIDA DE IMAGEN EN SEGUNDO PLANO
+# Acepta los bytes, responde 202 con un job_id y un hilo aparte hace la subida
+# a Cloudinary, así el worker no se queda bloqueado segundos por imagen.
+# Los jobs viven en memoria del proceso (suficiente con un único worker web).
+
+_upload_executor = ThreadPoolExecutor(max_workers=2)
+_upload_jobs = {}
+# Un job terminado que nadie consulta se desaloja pasado este plazo, para que
+# el dict no retenga Futures (con el resultado de Cloudinary) para siempre
+_UPLOAD_JOB_TTL = 600  # segundos
+
+
+def _programar_desalojo(job_id):
+    def _al_terminar(_job):
+        timer = Timer(_UPLOAD_JOB_TTL, _upload_jobs.pop, args=(job_id, None))
+        timer.daemon = True
+        timer.start()
+    return _al_terminar
+
+
+@api.route('/upload_image_async', methods=['POST'])
+def upload_image_async():
+    if 'file' not in request.files:
+        return jsonify({"msg": "No se ha adjuntado ninguna imagen"}), 400
+
+    image_bytes = request.files['file'].read()
+    job_id = uuid4().hex
+    job = _upload_executor.submit(cloudinary.uploader.upload, image_bytes)
+    job.add_done_callback(_programar_desalojo(job_id))
+    _upload_jobs[job_id] = job
+
+    return jsonify({"msg": "Imagen en proceso de subida", "job_id": job_id}), 202
+
+
+@api.route('/upload_image/<job_id>', methods=['GET'])
+def estado_subida_imagen(job_id):
+    job = _upload_jobs.get(job_id)
+
+    if job is None:
+        return jsonify({"msg": "Subida no encontrada"}), 404
+
+    if not job.done():
+        return jsonify({"status": "pending"}), 200
+
+    try:
+        result = job.result()
+    except Exception as e:
+        _upload_jobs.pop(job_id, None)
+        return jsonify({"status": "error", "error": str(e)}), 200
+
+    _upload_jobs.pop(job_id, None)
+    return jsonify({"status": "done", "url": result['secure_url']}), 200
+
 
 # RUTA PARA GUARDAR IMAGEN DEL RESTAURANTE EN EL BACKEND
 @api.route('/restaurantes/<int:restaurante_id>/imagen', methods=['PUT'])
 @jwt_required()  
 def actualizar_imagen_restaurante(restaurante_id):
-    body = request.get_json()  
+    body = request.get_json(silent=True) or {}  
     url_imagen = body.get('url_imagen')  
 
     if not url_imagen:
         return jsonify({'msg': 'Falta la URL de la imagen'}), 400
 
-    restaurante = Restaurantes.query.get(restaurante_id)
+    restaurante = db.session.get(Restaurantes, restaurante_id)
     if not restaurante:
-        return jsonify({'msg': 'Restaurante no encontrado'}), 404
+        return _ERR_RESTAURANTE_NO_ENCONTRADO()
 
     restaurante.image = url_imagen
     db.session.commit()
+    _invalidar_cache_restaurantes()
 
     return jsonify({'msg': 'Imagen actualizada con éxito', 'image': restaurante.image}), 200
 
@@ -784,19 +1017,20 @@ def actualizar_imagen_restaurante(restaurante_id):
 @api.route('/restaurantes/<int:restaurante_id>/imagen', methods=['DELETE'])
 @jwt_required()
 def eliminar_imagen_restaurante(restaurante_id):
-    body = request.get_json()
+    body = request.get_json(silent=True) or {}
     url_imagen = body.get('url_imagen')  
 
     if not url_imagen:
         return jsonify({'msg': 'Falta la URL de la imagen'}), 400
 
-    restaurante = Restaurantes.query.get(restaurante_id)
+    restaurante = db.session.get(Restaurantes, restaurante_id)
     if not restaurante:
-        return jsonify({'msg': 'Restaurante no encontrado'}), 404
+        return _ERR_RESTAURANTE_NO_ENCONTRADO()
 
     if restaurante.image == url_imagen:
         restaurante.image = None 
         db.session.commit()
+        _invalidar_cache_restaurantes()
         return jsonify({'msg': 'Imagen eliminada con éxito'}), 200
     else:
         return jsonify({'msg': 'Imagen no encontrada o no coincide'}), 404
@@ -810,7 +1044,7 @@ def eliminar_imagen_restaurante(restaurante_id):
 def cambiar_contrasena():
     print("hola")
     restaurante_id = get_jwt_identity()  
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
 
     current_password = data.get('currentPassword')
     new_password = data.get('newPassword')
@@ -818,10 +1052,10 @@ def cambiar_contrasena():
     if not current_password or not new_password:
         return jsonify({"msg": "Debe proporcionar la contraseña actual y la nueva contraseña"}), 400
 
-    restaurante = Restaurantes.query.get(restaurante_id)
+    restaurante = db.session.get(Restaurantes, restaurante_id)
 
     if not restaurante:
-        return jsonify({"msg": "Restaurante no encontrado"}), 404
+        return _ERR_RESTAURANTE_NO_ENCONTRADO()
 
     if not check_password_hash(restaurante.password_hash, current_password):
         return jsonify({"msg": "Contraseña actual incorrecta"}), 401
@@ -838,17 +1072,17 @@ def cambiar_contrasena():
 @jwt_required()
 def cambiar_contrasena_usuario():
     usuario_id = get_jwt_identity()
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
 
     current_password = data.get('currentPassword')
     new_password = data.get('newPassword')
 
     if not current_password or not new_password:
         return jsonify({"msg": "Debe proporcionar la contraseña actual y la nueva contraseña"}), 400
-    usuario = Usuario.query.get(usuario_id)
+    usuario = db.session.get(Usuario, usuario_id)
 
     if not usuario:
-        return jsonify({"msg": "Usuario no encontrado"}), 404
+        return _ERR_USUARIO_NO_ENCONTRADO()
 
     if not check_password_hash(usuario.password_hash, current_password):
         return jsonify({"msg": "Contraseña actual incorrecta"}), 401
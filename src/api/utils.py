@@ -82,6 +82,27 @@ def generate_sitemap(app):
         <p>Remember to specify a real endpoint path like: </p>
         <ul style="text-align: left;">"""+links_html+"</ul></div>"
 
+# Caché en proceso para respuestas de listados que cambian poco
+from flask_caching import Cache
+
+cache = Cache(config={'CACHE_TYPE': 'SimpleCache'})
+
+
+# Serializador JSON basado en orjson (Rust): mucho más rápido que el json de la
+# librería estándar para las listas de dicts que devuelven los listados
+import orjson
+from flask.json.provider import JSONProvider
+
+class OrjsonProvider(JSONProvider):
+
+    def dumps(self, obj, **kwargs):
+        # default=str cubre tipos no nativos de orjson (p. ej. Decimal)
+        return orjson.dumps(obj, default=str).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Función para validar si la hora de reserva está dentro del horario permitido del restaurante
 from datetime import time
 
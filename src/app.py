@@ -1,9 +1,10 @@
-from sqlalchemy.exc import ProgrammingError  # <-- Línea añadida para manejar el error si las tablas no están listas
+from sqlalchemy.exc import SQLAlchemyError  # <-- Línea añadida para manejar el error si las tablas no están listas
 
 """
 This module takes care of starting the API Server, Loading the DB and Adding the endpoints
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify, url_for, send_from_directory
 from flask_migrate import Migrate
 from flask_swagger import swagger
@@ -19,7 +20,7 @@ import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 
-from api.utils import APIException, generate_sitemap
+from api.utils import APIException, generate_sitemap, OrjsonProvider, cache
 from api.models import db
 from api.routes import api
 from api.admin import setup_admin
@@ -36,6 +37,7 @@ static_file_dir = os.path.join(os.path.dirname(
     os.path.realpath(__file__)), '../public/')
 app = Flask(__name__)
 app.url_map.strict_slashes = False
+app.json = OrjsonProvider(app)  # jsonify usa orjson para serializar las respuestas
 
 CORS(app)  
 
@@ -63,24 +65,49 @@ db_url = os.getenv("DATABASE_URL")
 if db_url is not None:
     app.config['SQLALCHEMY_DATABASE_URI'] = db_url.replace(
         "postgres://", "postgresql://")
+    # Pool dimensionado para ráfagas: reutiliza conexiones a Postgres
+    # (pre-ping descarta las caducadas).
+    # Nota: al subir a SQLAlchemy 2.x conviene añadir aquí
+    # 'insertmanyvalues_page_size': 500 para que los INSERT masivos (p. ej. el
+    # seed de restaurantes) se troceen solos; la opción no existe en 1.4
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
 else:
     app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite:////tmp/test.db"
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Rechaza cuerpos desmesurados antes de intentar parsear el JSON (las imágenes van a Cloudinary)
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 app.config['JWT_SECRET_KEY'] = 'nelvb' 
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)  
 
 MIGRATE = Migrate(app, db, compare_type=True)
 db.init_app(app)
+cache.init_app(app)
 
 # CARGAR CATEGORIAS Y RESTAURANTES INICIALES SI NO ESTÁN EN LA BASE DE DATOS / SOLO PARA PRUEBAS
-with app.app_context():
-    try:
-        cargar_categorias_iniciales()
-        db.session.commit()  
-        cargar_restaurantes_iniciales()
-    except ProgrammingError:
-        print("No se pueden cargar los datos iniciales porque las tablas no están listas.")  
+# La siembra corre en un hilo de fondo para que el arranque (y la primera
+# petición) no espere al hash de contraseña ni a las transacciones de carga;
+# el flag de setup_restaurantes evita siembras duplicadas
+_seed_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def _cargar_datos_iniciales(flask_app):
+    with flask_app.app_context():
+        try:
+            cargar_categorias_iniciales()
+            db.session.commit()
+            cargar_restaurantes_iniciales()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"No se pueden cargar los datos iniciales ({type(e).__name__}).")
+
+
+_seed_executor.submit(_cargar_datos_iniciales, app)
 
 jwt = JWTManager(app)
 
@@ -91,6 +118,12 @@ cloudinary.config(
     api_secret=os.getenv("CLOUDINARY_API_SECRET")
 )
 
+# El pool por defecto del SDK guarda una sola conexión por host (maxsize=1), así
+# que con subidas concurrentes cada petición extra paga un handshake TLS nuevo.
+# Reutilizamos hasta 16 conexiones keep-alive hacia api.cloudinary.com.
+cloudinary.uploader._http = cloudinary.utils.get_http_connector(
+    cloudinary.config(), dict(cloudinary.CERT_KWARGS, maxsize=16))
+
 setup_admin(app)
 
 setup_commands(app)
@@ -117,7 +150,7 @@ def serve_any_other_file(path):
 
 @app.route('/send-mail', methods=['POST'])
 def send_mail():
-    data = request.json
+    data = request.get_json(silent=True) or {}
     user_email = data.get('email')  
     restaurant_name = data.get('restaurant_name')  
     reservation_date = data.get('reservation_date')  
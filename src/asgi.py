@@ -0,0 +1,16 @@
+# This file exposes the application through an ASGI adapter so the I/O-bound
+# endpoints (database + Cloudinary) can be served by an async server, e.g.:
+#   uvicorn asgi:asgi_app --loop uvloop --http httptools --workers 4
+# The WSGI entrypoint in wsgi.py keeps working for gunicorn deployments.
+#
+# WsgiToAsgi runs each request in the adapter's thread pool, so the deliberately
+# slow password hashing in signup/login (50-200ms of CPU per call) happens off
+# the event loop and never stalls other in-flight requests. If these endpoints
+# are ever ported to native async views, that hashing must be wrapped in
+# run_in_executor to keep the same property.
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app
+
+asgi_app = WsgiToAsgi(app)